@@ -1,6 +1,16 @@
 import os
 import subprocess
 import sys
+import tomllib
+
+
+def read_project_version():
+    """从 pyproject.toml 读取版本号，用于区分不同版本的 onefile 解压缓存目录。"""
+    try:
+        with open("pyproject.toml", "rb") as file:
+            return tomllib.load(file)["project"]["version"]
+    except (OSError, KeyError, tomllib.TOMLDecodeError):
+        return "0.0.0"
 
 
 def build_with_nuitka():
@@ -15,13 +25,21 @@ def build_with_nuitka():
         return False
 
     python_exe = sys.executable or "python"
+    version = read_project_version()
     nuitka_cmd = [
         python_exe,
         "-m",
         "nuitka",
         "--onefile",
-        "--standalone",
+        f"--onefile-tempdir-spec={{CACHE_DIR}}/calendarNote/{version}",
+        f"--product-version={version}",
+        f"--file-version={version}",
+        "--lto=yes",
+        f"--jobs={os.cpu_count() or 4}",
+        "--prefer-source-code",
         "--windows-console-mode=disable",
+        "--python-flag=-O",
+        "--python-flag=no_docstrings",
         "--enable-plugin=pyqt6",
         "--include-qt-plugins=qml",
         "--include-data-files=icon.ico=icon.ico",
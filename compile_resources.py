@@ -1,17 +1,35 @@
 import os
 import subprocess
 
+# 以 zlib 最高级别压缩全部资源，缩小生成的 resources_rc.py 与打包体积
+RCC_COMPRESSION_ARGS = ['-compress', '9', '-threshold', '0']
+
+def _port_to_pyqt6(output_path):
+    """pyside6-rcc 生成的模块导入 PySide6，在 PyQt6 进程中加载会混入第二套 Qt；改为从 PyQt6 导入 QtCore"""
+    with open(output_path, encoding='utf-8') as file:
+        source = file.read()
+    source = source.replace('from PySide6 import QtCore', 'from PyQt6 import QtCore')
+    if 'PySide6' in source:
+        os.remove(output_path)
+        return False
+    with open(output_path, 'w', encoding='utf-8') as file:
+        file.write(source)
+    return True
+
 def compile_resources():
     """将资源文件编译成Python模块"""
     try:
         # 尝试使用pyrcc6（如果PyQt6-tools已安装）
-        subprocess.run(['pyrcc6', 'resources.qrc', '-o', 'resources_rc.py'], check=True)
+        subprocess.run(['pyrcc6', *RCC_COMPRESSION_ARGS, 'resources.qrc', '-o', 'resources_rc.py'], check=True)
         print("资源文件编译成功，使用pyrcc6")
     except (FileNotFoundError, subprocess.CalledProcessError):
         try:
             # 尝试使用pyside6-rcc（如果PySide6已安装）
-            subprocess.run(['pyside6-rcc', 'resources.qrc', '-o', 'resources_rc.py'], check=True)
-            print("资源文件编译成功，使用pyside6-rcc")
+            subprocess.run(['pyside6-rcc', *RCC_COMPRESSION_ARGS, 'resources.qrc', '-o', 'resources_rc.py'], check=True)
+            if not _port_to_pyqt6('resources_rc.py'):
+                print("错误: pyside6-rcc 生成的模块无法改写为 PyQt6 版本，已删除")
+                return False
+            print("资源文件编译成功，使用pyside6-rcc（已改写为从 PyQt6 导入）")
         except (FileNotFoundError, subprocess.CalledProcessError):
             print("错误: 无法编译资源文件。请确保已安装PyQt6-tools或PySide6")
             return False
@@ -1,20 +1,29 @@
 from __future__ import annotations
 
-import html
+import datetime
+import json
+import logging
 import os
 import re
 import sys
+import threading
 import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 
 from PyQt6.QtCore import (
     QAbstractListModel,
     QByteArray,
     QDate,
+    QFile,
     QModelIndex,
     QObject,
+    QRunnable,
     QSettings,
+    QThreadPool,
     QTimer,
     Qt,
     QUrl,
@@ -22,10 +31,18 @@ from PyQt6.QtCore import (
     pyqtSignal,
     pyqtSlot,
 )
-from PyQt6.QtGui import QColor, QIcon, QPalette
+from PyQt6.QtGui import QColor, QFont, QIcon, QPalette, QSyntaxHighlighter, QTextCharFormat, QTextDocument
 from PyQt6.QtQml import QQmlApplicationEngine
+from PyQt6.QtQuick import QQuickTextDocument
 from PyQt6.QtWidgets import QApplication, QMessageBox
 
+try:
+    import resources_rc  # noqa: F401  由 compile_resources.py 生成，存在时图标从 Qt 资源读取
+except ImportError:
+    resources_rc = None
+
+logger = logging.getLogger(__name__)
+
 TITLE_BASE = "日历笔记本"
 SETTINGS_ORGANIZATION = "calendarNote"
 SETTINGS_APPLICATION = "calendarNote"
@@ -37,6 +54,16 @@ MAX_SEARCH_RESULTS = 100
 MAX_SEARCHABLE_FILE_SIZE = 1024 * 1024
 MAX_PREVIEW_FILE_SIZE = 512 * 1024
 MAX_CONTENT_LENGTH = 200_000
+ICON_RESOURCE_PATH = ":/icon.ico"
+ENTRY_CACHE_SIZE = 64
+SEARCH_READ_WORKERS = 8
+SEARCH_TEXT_CACHE_SIZE = 4096
+SEARCH_PROGRESS_INTERVAL_S = 0.05
+MIGRATION_SENTINEL_NAME = ".migrated"
+EMPTY_SWEEP_SENTINEL_NAME = ".empty-swept"
+ENTRY_INDEX_NAME = ".index.json"
+ENTRY_INDEX_FLUSH_DELAY_MS = 500
+ENTRY_FILENAME_RE = re.compile(r"^(\d{4})-(0[1-9]|1[0-2])-(0[1-9]|[12]\d|3[01])\.txt$", re.ASCII)
 APP_THEME_PALETTES = {
     THEME_MODE_DARK: {
         "window": "#09090B",
@@ -82,14 +109,108 @@ WEEKDAY_LABELS = {
 }
 
 
-@dataclass(slots=True)
+def _format_iso_date(date: QDate) -> str:
+    """返回 yyyy-MM-dd 文本；直接用整数访问器拼接，不经过 Qt 的格式串解析。"""
+    return f"{date.year():04d}-{date.month():02d}-{date.day():02d}"
+
+
+def _decode_entry_bytes(data: bytes) -> str:
+    """按 UTF-8 解码日记内容，并与文本模式读取一样把 CRLF / CR 统一为 LF。"""
+    text = data.decode("utf-8")
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
+
+
+def _parse_entry_filename(filename: str) -> tuple[int, int, int] | None:
+    """解析 YYYY-MM-DD.txt 形式的文件名；先用长度和正则做 O(1) 过滤，再校验日期本身。"""
+    if len(filename) != 14:
+        return None
+    match = ENTRY_FILENAME_RE.match(filename)
+    if match is None:
+        return None
+    year, month, day = (int(part) for part in match.groups())
+    try:
+        datetime.date(year, month, day)
+    except ValueError:
+        return None
+    return year, month, day
+
+
+def _read_search_text(file_path: str) -> str | None:
+    """读取检索用正文：最多 MAX_PREVIEW_FILE_SIZE 个字符，忽略非法 UTF-8，换行由文本模式统一。可在工作线程中调用。
+
+    上限按字符而非字节计，中文日记每字占 3 字节，按字节截断会让大文件末尾约三分之二的内容检索不到。
+    """
+    try:
+        with open(file_path, "r", encoding="utf-8", errors="ignore") as file:
+            return file.read(MAX_PREVIEW_FILE_SIZE)
+    except OSError:
+        return None
+
+
+def _read_search_preview(file_path: str, file_size: int) -> str | None:
+    """读取搜索结果的预览正文，超出预览或显示上限时截断并附上提示。"""
+    content = _read_search_text(file_path)
+    if content is None:
+        return None
+    if file_size > MAX_PREVIEW_FILE_SIZE:
+        content += "\n\n[文件较大，预览已截断...]"
+    if len(content) > MAX_CONTENT_LENGTH:
+        content = content[:MAX_CONTENT_LENGTH] + "\n\n[内容过长，已截断显示...]"
+    return content
+
+
+def _write_entry_atomically(filename: str, data: bytes, durable: bool = True) -> None:
+    """先写同目录临时文件再 os.replace，写入中断时原日记保持完整。可在工作线程中调用。
+
+    durable 为真时在替换前 fsync 临时文件，断电后不会换上一个尚未落盘的空文件；
+    自动保存频繁且随后还会再保存，跳过这次刷盘。
+    """
+    temp_path = f"{filename}.tmp"
+    try:
+        with open(temp_path, "wb") as file:
+            file.write(data)
+            if durable:
+                file.flush()
+                os.fsync(file.fileno())
+        os.replace(temp_path, filename)
+    except OSError:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+
+
+def _utf16_offset(text: str, index: int) -> int:
+    """把 Python 码点下标换算成 Qt 使用的 UTF-16 码元下标。"""
+    return len(text[:index].encode("utf-16-le")) // 2
+
+
+@lru_cache(maxsize=512)
+def _build_entry_path(folder_root: str, year: int, month: int, day: int) -> str:
+    """按年月日拼出新结构下的日记路径，结果纯由参数决定，可安全缓存。"""
+    return os.path.join(
+        folder_root,
+        f"{year:04d}",
+        f"{month:02d}",
+        f"{year:04d}-{month:02d}-{day:02d}.txt",
+    )
+
+
+@dataclass(slots=True, frozen=True)
 class SearchResultItem:
-    """全局搜索结果。"""
+    """全局搜索结果；只保留路径与摘要，正文在打开预览时才读取。"""
 
     date: QDate
-    content: str
+    file_path: str
+    file_size: int
     match_text: str
 
+    def load_content(self) -> str:
+        return _read_search_preview(self.file_path, self.file_size) or ""
+
 
 class SearchResultModel(QAbstractListModel):
     """供 QML 使用的搜索结果模型。"""
@@ -97,7 +218,6 @@ class SearchResultModel(QAbstractListModel):
     DateRole = Qt.ItemDataRole.UserRole + 1
     DateLabelRole = Qt.ItemDataRole.UserRole + 2
     MatchTextRole = Qt.ItemDataRole.UserRole + 3
-    ContentRole = Qt.ItemDataRole.UserRole + 4
     DisplayRole = Qt.ItemDataRole.UserRole + 5
 
     def __init__(self, parent: QObject | None = None):
@@ -113,36 +233,39 @@ class SearchResultModel(QAbstractListModel):
         if not index.isValid() or not (0 <= index.row() < len(self._results)):
             return None
 
+        # 委托每个角色单独取一次：按角色分支，只计算被请求的那一项
         item = self._results[index.row()]
-        date_text = item.date.toString("yyyy-MM-dd")
-        display_text = item.match_text or ""
-        if len(display_text) > 80:
-            display_text = display_text[:77] + "..."
-
-        if role == self.DateRole:
-            return date_text
-        if role == self.DateLabelRole:
-            return date_text
+        if role in (self.DateRole, self.DateLabelRole):
+            return _format_iso_date(item.date)
         if role == self.MatchTextRole:
-            return display_text
-        if role == self.ContentRole:
-            return item.content
+            return self._display_text(item)
         if role in (self.DisplayRole, Qt.ItemDataRole.DisplayRole):
+            date_text = _format_iso_date(item.date)
+            display_text = self._display_text(item)
             return f"{date_text}  {display_text}" if display_text else date_text
         return None
 
+    @staticmethod
+    def _display_text(item: SearchResultItem) -> str:
+        display_text = item.match_text or ""
+        if len(display_text) > 80:
+            display_text = display_text[:77] + "..."
+        return display_text
+
     def roleNames(self) -> dict[int, QByteArray]:
         return {
             self.DateRole: QByteArray(b"date"),
             self.DateLabelRole: QByteArray(b"dateLabel"),
             self.MatchTextRole: QByteArray(b"matchText"),
-            self.ContentRole: QByteArray(b"content"),
             self.DisplayRole: QByteArray(b"display"),
         }
 
     def set_results(self, results: list[SearchResultItem]) -> None:
+        """整体替换结果：一次重置代替逐行插入；列表直接接管，调用方不应再修改它。"""
+        if not results and not self._results:
+            return
         self.beginResetModel()
-        self._results = list(results)
+        self._results = results
         self.endResetModel()
 
     def get_result(self, index: int) -> SearchResultItem | None:
@@ -154,6 +277,257 @@ class SearchResultModel(QAbstractListModel):
         self.set_results([])
 
 
+class SearchPreviewHighlighter(QSyntaxHighlighter):
+    """在纯文本预览上标出关键词；按文本块着色，无需把整篇日记转义成 HTML 再交给富文本解析。"""
+
+    def __init__(self, document: QTextDocument):
+        super().__init__(document)
+        self._pattern: re.Pattern[str] | None = None
+        self._match_format = QTextCharFormat()
+        self._match_format.setBackground(QColor("#FDE68A"))
+        self._match_format.setForeground(QColor("#7C2D12"))
+        self._match_format.setFontWeight(QFont.Weight.DemiBold)
+
+    def set_keyword(self, keyword: str) -> None:
+        pattern = re.compile(re.escape(keyword), re.IGNORECASE) if keyword else None
+        if pattern == self._pattern:
+            return
+        self._pattern = pattern
+        self.rehighlight()
+
+    def highlightBlock(self, text: str) -> None:
+        if self._pattern is None:
+            return
+        # setFormat 按 UTF-16 码元计位置，Python 下标按码点；块内有 emoji 等 BMP 外字符时需要换算
+        has_surrogates = not text.isascii() and len(text.encode("utf-16-le")) != 2 * len(text)
+        for match in self._pattern.finditer(text):
+            start, end = match.span()
+            if has_surrogates:
+                start, end = _utf16_offset(text, start), _utf16_offset(text, end)
+            self.setFormat(start, end - start, self._match_format)
+
+
+class SearchTaskSignals(QObject):
+    """DiarySearchTask 的跨线程信号；对象属于主线程，槽函数因此以排队方式在主线程执行。"""
+
+    progress = pyqtSignal(int, int, int)
+    finished = pyqtSignal(int, object, object)
+    failed = pyqtSignal(int, str)
+
+
+class DiarySearchTask(QRunnable):
+    """在线程池中执行全文检索，只读文件系统，不访问任何界面对象。"""
+
+    def __init__(
+        self,
+        generation: int,
+        diary_folder_base: str,
+        keyword: str,
+        text_cache: dict[str, tuple[int, int, str]],
+    ):
+        super().__init__()
+        self.setAutoDelete(False)
+        self.signals = SearchTaskSignals()
+        self.generation = generation
+        # 检索缓存的副本归任务独占，完成后整体交回主线程替换
+        self.text_cache = text_cache
+        self._diary_folder_base = diary_folder_base
+        self._keyword = keyword
+        # 只用于在已命中的少量原文里定位，全量筛选仍走缓存小写正文上的 str.find
+        self._pattern = re.compile(re.escape(keyword), re.IGNORECASE)
+        self._uncached_texts: dict[str, tuple[int, int, str]] = {}
+        self._cancelled = False
+
+    def cancel(self) -> None:
+        self._cancelled = True
+
+    def run(self) -> None:
+        try:
+            results = self.search()
+        except Exception as exc:  # pragma: no cover - 防御性处理
+            self.signals.failed.emit(self.generation, str(exc))
+            return
+        if not self._cancelled:
+            self.signals.finished.emit(self.generation, results, self.text_cache)
+
+    def search(self) -> list[SearchResultItem]:
+        normalized_keyword = self._keyword.lower()
+        diary_files = [entry for entry in self._collect_all_diary_files() if entry[1] <= MAX_SEARCHABLE_FILE_SIZE]
+
+        self._prune_search_text_cache(diary_files)
+        self._refresh_search_text_cache(diary_files)
+
+        # 先在内存中的小写正文里确认命中位置，只有命中的文件才重新读取原文构造结果
+        hits: list[tuple[str, int, int]] = []
+        for file_path, file_size, _mtime_ns in diary_files:
+            if self._cancelled:
+                return []
+            cached = self.text_cache.get(file_path) or self._uncached_texts.get(file_path)
+            if cached is None:
+                continue
+            position = cached[2].find(normalized_keyword)
+            if position < 0:
+                continue
+            hits.append((file_path, file_size, position))
+            if len(hits) >= MAX_SEARCH_RESULTS:
+                break
+
+        with ThreadPoolExecutor(max_workers=SEARCH_READ_WORKERS) as executor:
+            items = executor.map(lambda hit: self._search_in_file(*hit), hits)
+            results = [item for item in items if item is not None]
+
+        results.sort(key=lambda item: item.date, reverse=True)
+        return results
+
+    def _refresh_search_text_cache(self, diary_files: list[tuple[str, int, int]]) -> None:
+        """并发读取缓存缺失或已过期的文件；读盘释放 GIL，冷启动时多个文件的 I/O 可以重叠。"""
+        stale_files = []
+        for file_path, file_size, mtime_ns in diary_files:
+            cached = self.text_cache.get(file_path)
+            if cached is None or cached[0] != mtime_ns or cached[1] != file_size:
+                stale_files.append((file_path, file_size, mtime_ns))
+        if not stale_files:
+            return
+
+        total_files = len(stale_files)
+        last_progress = -SEARCH_PROGRESS_INTERVAL_S
+        with ThreadPoolExecutor(max_workers=SEARCH_READ_WORKERS) as executor:
+            texts = executor.map(_read_search_text, [file_path for file_path, _size, _mtime in stale_files])
+            for index, ((file_path, file_size, mtime_ns), text) in enumerate(zip(stale_files, texts), start=1):
+                if self._cancelled:
+                    executor.shutdown(cancel_futures=True)
+                    return
+                # 按时间节流：每秒至多约 20 次进度信号，不随磁盘快慢变成刷屏或长时间无反馈
+                now = time.monotonic()
+                if now - last_progress >= SEARCH_PROGRESS_INTERVAL_S:
+                    last_progress = now
+                    self.signals.progress.emit(self.generation, index, total_files)
+                if text is None:
+                    self.text_cache.pop(file_path, None)
+                    continue
+                entry = (mtime_ns, file_size, text.lower())
+                # 缓存条目有上限：更新已有条目不受限，超出上限的新文件只在本次检索中使用
+                if file_path in self.text_cache or len(self.text_cache) < SEARCH_TEXT_CACHE_SIZE:
+                    self.text_cache[file_path] = entry
+                else:
+                    self._uncached_texts[file_path] = entry
+
+    def _prune_search_text_cache(self, diary_files: list[tuple[str, int, int]]) -> None:
+        if len(self.text_cache) <= len(diary_files):
+            return
+        live_paths = {file_path for file_path, _size, _mtime in diary_files}
+        for file_path in self.text_cache.keys() - live_paths:
+            del self.text_cache[file_path]
+
+    def _collect_all_diary_files(self) -> list[tuple[str, int, int]]:
+        """单次 os.scandir 递归遍历，返回 (路径, 字节数, mtime)；元数据取自目录项，检索时不再逐个 stat。
+
+        结果按文件名（即日期）从新到旧排列，结果数达到上限提前停止时保留的是最近的日记。
+        """
+        files_by_name: dict[str, tuple[int, str, int, int]] = {}
+        pending: list[tuple[str, int]] = [(self._diary_folder_base, 0)]
+
+        while pending:
+            folder, depth = pending.pop()
+            try:
+                with os.scandir(folder) as entries:
+                    for entry in entries:
+                        # 与 os.walk 一致不进入符号链接目录，避免链接成环或遍历到日记目录之外
+                        if entry.is_dir(follow_symlinks=False):
+                            pending.append((entry.path, depth + 1))
+                            continue
+                        if _parse_entry_filename(entry.name) is None or not entry.is_file():
+                            continue
+                        existing = files_by_name.get(entry.name)
+                        # 新旧路径并存时保留层级更深的新结构文件
+                        if existing is not None and existing[0] >= depth:
+                            continue
+                        try:
+                            file_stat = entry.stat()
+                        except OSError:
+                            continue
+                        files_by_name[entry.name] = (depth, entry.path, file_stat.st_size, file_stat.st_mtime_ns)
+            except OSError:
+                continue
+
+        return [
+            (path, size, mtime_ns)
+            for _name, (_depth, path, size, mtime_ns) in sorted(files_by_name.items(), reverse=True)
+        ]
+
+    def _search_in_file(
+        self,
+        file_path: str,
+        file_size: int,
+        position: int,
+    ) -> SearchResultItem | None:
+        """为一个已确认命中的文件生成结果；只读文件、不改共享状态，可在线程池中并发调用。"""
+        parsed = _parse_entry_filename(os.path.basename(file_path))
+        if parsed is None:
+            return None
+
+        # 原文只用于截取摘要，不随结果保留，上百条结果不会各自持有整篇日记
+        content = _read_search_preview(file_path, file_size)
+        if content is None:
+            return None
+
+        # lower() 可能改变个别字符的长度，小写正文里的下标不一定对得上原文，摘要位置以原文上的匹配为准
+        match = self._pattern.search(content)
+        match_start, match_end = match.span() if match else (position, position + len(self._keyword))
+
+        return SearchResultItem(
+            date=QDate(*parsed),
+            file_path=file_path,
+            file_size=file_size,
+            match_text=self._extract_context(content, match_start, match_end),
+        )
+
+    def _extract_context(self, content: str, match_start: int, match_end: int, context_chars: int = 42) -> str:
+        start = max(0, match_start - context_chars)
+        end = min(len(content), match_end + context_chars)
+        snippet = content[start:end].replace("\n", " ").strip()
+        if start > 0:
+            snippet = "..." + snippet
+        if end < len(content):
+            snippet += "..."
+        return snippet
+
+
+class EntrySaveSignals(QObject):
+    """EntrySaveTask 的完成信号；与检索任务一样由主线程持有，槽函数排队执行。"""
+
+    finished = pyqtSignal(int)
+
+
+class EntrySaveTask(QRunnable):
+    """在线程池中写入一篇日记，只做文件 I/O；结果留在任务上，由主线程统一处理缓存与界面状态。"""
+
+    def __init__(self, generation: int, date: QDate, filename: str, content: str):
+        super().__init__()
+        self.setAutoDelete(False)
+        self.signals = EntrySaveSignals()
+        self.generation = generation
+        self.date = date
+        self.filename = filename
+        self.content = content
+        self.mtime_ns: int | None = None
+        self.error: str | None = None
+        self.done = threading.Event()
+
+    def run(self) -> None:
+        try:
+            _write_entry_atomically(self.filename, self.content.encode("utf-8"), durable=False)
+            try:
+                self.mtime_ns = os.stat(self.filename).st_mtime_ns
+            except OSError:
+                self.mtime_ns = None
+        except OSError as exc:
+            self.error = str(exc)
+        finally:
+            self.done.set()
+        self.signals.finished.emit(self.generation)
+
+
 class DiaryBackend(QObject):
     """QML 界面使用的日记后端。"""
 
@@ -171,7 +545,6 @@ class DiaryBackend(QObject):
     searchResultCountTextChanged = pyqtSignal()
     searchPreviewContentChanged = pyqtSignal()
     searchPreviewDateChanged = pyqtSignal()
-    searchPreviewRichTextChanged = pyqtSignal()
     calendarVersionChanged = pyqtSignal()
     themeModeChanged = pyqtSignal()
     searchCompleted = pyqtSignal(bool, str)
@@ -190,15 +563,31 @@ class DiaryBackend(QObject):
         self._auto_save_enabled = True
         self._auto_save_interval = 30_000
         self._is_auto_saving = False
-        self._last_edit_time = time.time()
+        self._last_edit_time = time.monotonic()
         self._status_message = ""
         self._search_busy = False
         self._search_result_count_text = "找到 0 个结果"
         self._search_preview_content = ""
+        # 当前预览对应的 (路径, mtime)；同一文件未变化时重复选中不再读盘
+        self._search_preview_source: tuple[str, int] | None = None
         self._search_preview_date = ""
         self._search_keyword = ""
+        self._search_preview_highlighter: SearchPreviewHighlighter | None = None
         self._calendar_version = 0
+        self._calendar_refresh_pending = False
+        self._pending_month_preloads: set[tuple[int, int]] = set()
+        self._entry_index: dict[str, list] | None = None
         self._month_entry_cache: dict[tuple[int, int], set[str]] = {}
+        self._month_folder_mtimes: dict[tuple[int, int], int | None] = {}
+        self._legacy_entry_names: set[str] | None = None
+        self._entry_cache: OrderedDict[str, tuple[int, str]] = OrderedDict()
+        self._search_text_cache: dict[str, tuple[int, int, str]] = {}
+        self._search_task: DiarySearchTask | None = None
+        self._search_generation = 0
+        self._save_task: EntrySaveTask | None = None
+        self._save_generation = 0
+        self._known_entry_folders: set[str] = set()
+        self._migration_done = False
         self._search_results_model = SearchResultModel(self)
         self._settings = QSettings(SETTINGS_ORGANIZATION, SETTINGS_APPLICATION)
         self._theme_mode = self._normalize_theme_mode(
@@ -213,6 +602,11 @@ class DiaryBackend(QObject):
         self._date_change_timer.setInterval(60_000)
         self._date_change_timer.timeout.connect(self.check_for_date_update)
 
+        self._entry_index_timer = QTimer(self)
+        self._entry_index_timer.setSingleShot(True)
+        self._entry_index_timer.setInterval(ENTRY_INDEX_FLUSH_DELAY_MS)
+        self._entry_index_timer.timeout.connect(self.flush_entry_index)
+
         self._status_timer = QTimer(self)
         self._status_timer.setSingleShot(True)
         self._status_timer.timeout.connect(self.clearStatusMessage)
@@ -220,16 +614,17 @@ class DiaryBackend(QObject):
         self._apply_application_theme()
         self.ensure_base_diary_folder()
         self.load_entry_for_date(self._current_date)
-        self._ensure_month_cache(self._current_date.year(), self._current_date.month())
-        self._bump_calendar_version()
+        self._request_month_preload(self._current_date.year(), self._current_date.month())
 
-        if self._auto_save_enabled:
-            self._auto_save_timer.start()
+        self._sync_auto_save_timer()
         self._date_change_timer.start()
+        # 旧目录迁移不影响首屏（当天文件由按需迁移兜底），放到事件循环启动后执行
+        QTimer.singleShot(0, self.migrate_old_entries)
+        QTimer.singleShot(0, self.remove_empty_entries)
 
     @pyqtProperty(str, notify=currentDateChanged)
     def currentDate(self) -> str:
-        return self._current_date.toString("yyyy-MM-dd")
+        return _format_iso_date(self._current_date)
 
     @pyqtProperty(str, notify=currentDateDisplayChanged)
     def currentDateDisplay(self) -> str:
@@ -245,7 +640,7 @@ class DiaryBackend(QObject):
 
     @pyqtProperty(str, notify=todayLabelChanged)
     def todayLabel(self) -> str:
-        return f"今天 · {self._last_system_date.toString('yyyy-MM-dd')}"
+        return f"今天 · {_format_iso_date(self._last_system_date)}"
 
     @pyqtProperty(str, notify=themeModeChanged)
     def themeMode(self) -> str:
@@ -292,10 +687,6 @@ class DiaryBackend(QObject):
     def searchPreviewDate(self) -> str:
         return self._search_preview_date
 
-    @pyqtProperty(str, notify=searchPreviewRichTextChanged)
-    def searchPreviewRichText(self) -> str:
-        return self._build_highlighted_preview_html(self._search_preview_content, self._search_keyword)
-
     @pyqtProperty(int, notify=calendarVersionChanged)
     def calendarVersion(self) -> int:
         return self._calendar_version
@@ -314,7 +705,7 @@ class DiaryBackend(QObject):
             return
 
         self._current_content = text
-        self._last_edit_time = time.time()
+        self._last_edit_time = time.monotonic()
         self._set_content_modified(text != self._last_saved_content)
 
     @pyqtSlot()
@@ -361,38 +752,91 @@ class DiaryBackend(QObject):
         if not self._auto_save_enabled or not self._content_modified or self._is_auto_saving:
             return
 
-        if time.time() - self._last_edit_time < 2.5:
+        if time.monotonic() - self._last_edit_time < 2.5:
             return
 
         self._is_auto_saving = True
         self.autoSaveStatusTextChanged.emit()
+        if self._start_background_save():
+            return
         try:
-            saved = self.save_entry_for_date(self._current_date, status_text="自动保存完成")
+            saved = self.save_entry_for_date(self._current_date, status_text="自动保存完成", durable=False)
             if saved:
-                self._last_edit_time = time.time()
+                self._last_edit_time = time.monotonic()
         finally:
             self._is_auto_saving = False
             self.autoSaveStatusTextChanged.emit()
 
+    def finish_pending_save(self) -> None:
+        """等待后台自动保存写完并立即处理结果；同步保存、切换日期与退出前调用，避免新旧两次写入交错。"""
+        task = self._save_task
+        if task is None:
+            return
+        task.done.wait()
+        self._complete_save_task()
+
+    def _start_background_save(self) -> bool:
+        """把自动保存的写盘交给线程池；清空删除等少见情形返回 False，由调用方走同步保存。"""
+        raw_content = self._current_content
+        if not raw_content or raw_content.isspace():
+            return False
+        filename = self.get_filename_for_date(self._current_date)
+        try:
+            self._ensure_entry_folder(os.path.dirname(filename))
+        except OSError:
+            return False
+
+        self._save_generation += 1
+        task = EntrySaveTask(self._save_generation, QDate(self._current_date), filename, raw_content)
+        task.signals.finished.connect(self._on_save_task_finished)
+        self._save_task = task
+        QThreadPool.globalInstance().start(task)
+        return True
+
+    def _on_save_task_finished(self, generation: int) -> None:
+        if self._save_task is not None and self._save_task.generation == generation:
+            self._complete_save_task()
+
+    def _complete_save_task(self) -> None:
+        task = self._save_task
+        self._save_task = None
+        self._is_auto_saving = False
+        self.autoSaveStatusTextChanged.emit()
+
+        date_text = _format_iso_date(task.date)
+        if task.error is not None:
+            self._known_entry_folders.discard(os.path.dirname(task.filename))
+            QMessageBox.warning(None, "保存错误", f"无法保存 {date_text} 的日记：\n\n{task.error}")
+            return
+
+        self._record_saved_entry(task.filename, task.content, task.mtime_ns)
+        if task.date == self._current_date:
+            # 写盘期间继续输入的内容仍算未保存，交给下一轮自动保存
+            self._last_saved_content = task.content
+            self._set_content_modified(self._current_content != task.content)
+        self._update_month_cache_entry(task.date, True)
+        self._last_edit_time = time.monotonic()
+        self._set_status(f"自动保存完成 · {date_text}", 2000)
+
     @pyqtSlot(int, int)
     def preloadMonth(self, year: int, month_zero_based: int) -> None:
         month = month_zero_based + 1
         if year < 1 or month < 1 or month > 12:
             return
-        self._ensure_month_cache(year, month)
-        self._bump_calendar_version()
-
-    @pyqtSlot(str, result=bool)
-    def hasEntryForDate(self, iso_date: str) -> bool:
-        date = QDate.fromString(iso_date, "yyyy-MM-dd")
-        if not date.isValid():
-            return False
+        self._preload_month(year, month)
 
-        cache_key = (date.year(), date.month())
-        cached = self._month_entry_cache.get(cache_key)
-        if cached is not None:
-            return iso_date in cached
-        return self.date_has_entry(date)
+    @pyqtSlot(int, int, result=list)
+    def entriesForMonth(self, year: int, month_zero_based: int) -> list[str]:
+        """返回该月有日记的日期文本；日历每次刷新按月取一次，格子在 QML 内查表而不是逐格调用后端。"""
+        month = month_zero_based + 1
+        if year < 1 or month < 1 or month > 12:
+            return []
+        cached = self._month_entry_cache.get((year, month))
+        if cached is None:
+            # 绘制路径上不做目录扫描：先按无日记显示，整月扫描推迟到事件循环，完成后统一刷新
+            self._request_month_preload(year, month)
+            return []
+        return list(cached)
 
     @pyqtSlot(str)
     def performGlobalSearch(self, keyword: str) -> None:
@@ -406,17 +850,48 @@ class DiaryBackend(QObject):
         if not self.save_entry_for_date(self._current_date, status_text=""):
             return
 
+        if self._search_task is not None:
+            self._search_task.cancel()
+        self._search_generation += 1
+        task = DiarySearchTask(
+            self._search_generation,
+            self._diary_folder_base,
+            keyword,
+            dict(self._search_text_cache),
+        )
+        task.signals.progress.connect(self._on_search_progress)
+        task.signals.finished.connect(self._on_search_finished)
+        task.signals.failed.connect(self._on_search_failed)
+        self._search_task = task
+
         self._set_search_busy(True)
         self._set_status(f"正在搜索“{keyword}”...", 0)
-        self._app.processEvents()
+        # 文件读取放到线程池，界面线程在检索期间保持响应，不再依赖 processEvents()
+        QThreadPool.globalInstance().start(task)
 
-        try:
-            results = self.search_diary_entries(keyword)
-        except Exception as exc:  # pragma: no cover - 防御性处理
-            self._set_search_busy(False)
-            self.clearStatusMessage()
-            QMessageBox.critical(None, "搜索错误", f"搜索过程中发生错误：\n{exc}")
+    def _on_search_progress(self, generation: int, index: int, total_files: int) -> None:
+        if generation == self._search_generation:
+            self._set_status(f"正在搜索… {index}/{total_files}", 0)
+
+    def _on_search_failed(self, generation: int, message: str) -> None:
+        if generation != self._search_generation:
+            return
+        self._search_task = None
+        self._set_search_busy(False)
+        self.clearStatusMessage()
+        QMessageBox.critical(None, "搜索错误", f"搜索过程中发生错误：\n{message}")
+
+    def _on_search_finished(
+        self,
+        generation: int,
+        results: list[SearchResultItem],
+        text_cache: dict[str, tuple[int, int, str]],
+    ) -> None:
+        if generation != self._search_generation:
             return
+        self._search_task = None
+        self._search_text_cache = text_cache
+        keyword = self._search_keyword
 
         self._set_search_busy(False)
         self._search_results_model.set_results(results)
@@ -434,25 +909,41 @@ class DiaryBackend(QObject):
         QMessageBox.information(None, "搜索结果", f"未找到包含“{keyword}”的日记")
         self.searchCompleted.emit(False, keyword)
 
+    @pyqtSlot(QQuickTextDocument)
+    def attachSearchPreviewDocument(self, text_document: QQuickTextDocument) -> None:
+        """为 QML 预览框的文档挂上关键词高亮器；预览以纯文本显示，正文变化时由高亮器按块重新着色。"""
+        document = text_document.textDocument()
+        if document is None:
+            return
+        self._search_preview_highlighter = SearchPreviewHighlighter(document)
+        self._search_preview_highlighter.set_keyword(self._search_keyword)
+
     @pyqtSlot(int)
     def selectSearchResult(self, index: int) -> None:
         item = self._search_results_model.get_result(index)
         if item is None:
+            self._search_preview_source = None
             if self._search_preview_content:
                 self._search_preview_content = ""
                 self.searchPreviewContentChanged.emit()
-                self.searchPreviewRichTextChanged.emit()
             if self._search_preview_date:
                 self._search_preview_date = ""
                 self.searchPreviewDateChanged.emit()
             return
 
-        content = item.content
-        date_text = item.date.toString("yyyy-MM-dd")
+        try:
+            source = (item.file_path, os.stat(item.file_path).st_mtime_ns)
+        except OSError:
+            source = None
+        if source is not None and source == self._search_preview_source:
+            content = self._search_preview_content
+        else:
+            content = item.load_content()
+            self._search_preview_source = source
+        date_text = _format_iso_date(item.date)
         if content != self._search_preview_content:
             self._search_preview_content = content
             self.searchPreviewContentChanged.emit()
-            self.searchPreviewRichTextChanged.emit()
         if date_text != self._search_preview_date:
             self._search_preview_date = date_text
             self.searchPreviewDateChanged.emit()
@@ -487,12 +978,10 @@ class DiaryBackend(QObject):
             self._current_date = current_system_date
             self._emit_date_related_signals()
             self.load_entry_for_date(self._current_date)
-            self._ensure_month_cache(self._current_date.year(), self._current_date.month())
-            self._bump_calendar_version()
+            self._preload_month(self._current_date.year(), self._current_date.month())
             self._set_status(f"已切换到今天 {self.currentDate}", 2000)
         else:
-            self._ensure_month_cache(current_system_date.year(), current_system_date.month())
-            self._bump_calendar_version()
+            self._preload_month(current_system_date.year(), current_system_date.month())
 
     def ensure_base_diary_folder(self) -> None:
         if os.path.isdir(self._diary_folder_base):
@@ -506,6 +995,101 @@ class DiaryBackend(QObject):
                 f"无法创建日记目录：\n{self._diary_folder_base}\n\n{exc}",
             )
 
+    def migrate_old_entries(self) -> None:
+        """把旧扁平结构的日记一次性移入 YYYY/MM 目录，成功后写入标记文件不再重复扫描。"""
+        if self._migration_done:
+            return
+        self._migration_done = True
+
+        sentinel = os.path.join(self._diary_folder_base, MIGRATION_SENTINEL_NAME)
+        if os.path.exists(sentinel):
+            self._legacy_entry_names = set()
+            return
+
+        failed = False
+        try:
+            with os.scandir(self._old_diary_folder) as entries:
+                legacy_entries = [entry for entry in entries if entry.is_file()]
+        except OSError as exc:
+            logger.warning("扫描旧目录失败 %s: %s", self._old_diary_folder, exc)
+            return
+
+        for entry in legacy_entries:
+            match = ENTRY_FILENAME_RE.match(entry.name)
+            if match is None:
+                continue
+            year, month, day = match.groups()
+            try:
+                datetime.date(int(year), int(month), int(day))
+            except ValueError:
+                continue
+
+            new_file = os.path.join(self._diary_folder_base, year, month, entry.name)
+            if os.path.exists(new_file):
+                continue
+            try:
+                self._ensure_entry_folder(os.path.dirname(new_file))
+                os.replace(entry.path, new_file)
+            except OSError as exc:
+                failed = True
+                logger.warning("迁移旧日记失败 %s: %s", entry.path, exc)
+
+        if failed:
+            self._legacy_entry_names = None
+            return
+
+        self._legacy_entry_names = set()
+        try:
+            with open(sentinel, "w", encoding="utf-8"):
+                pass
+        except OSError as exc:
+            logger.warning("写入迁移标记失败：%s", exc)
+
+    def remove_empty_entries(self) -> None:
+        """一次性清理旧版本保存留下的 0 字节日记文件，此后“文件存在”即代表“有日记”。"""
+        sentinel = os.path.join(self._diary_folder_base, EMPTY_SWEEP_SENTINEL_NAME)
+        if os.path.exists(sentinel):
+            return
+
+        removed = False
+        failed = False
+        for dir_path, _dir_names, file_names in os.walk(self._diary_folder_base):
+            for file_name in file_names:
+                parsed = _parse_entry_filename(file_name)
+                if parsed is None:
+                    continue
+                file_path = os.path.join(dir_path, file_name)
+                try:
+                    if os.path.getsize(file_path) > 0:
+                        continue
+                    os.remove(file_path)
+                except OSError as exc:
+                    logger.warning("清理空日记失败 %s: %s", file_path, exc)
+                    failed = True
+                    continue
+                removed = True
+                cached = self._month_entry_cache.get(parsed[:2])
+                if cached is not None:
+                    cached.discard(file_name[:-4])
+
+        if removed:
+            self._bump_calendar_version()
+        if failed:
+            # 有文件没删掉时不写标记，下次启动再清理一次。
+            return
+        try:
+            with open(sentinel, "w", encoding="utf-8"):
+                pass
+        except OSError as exc:
+            logger.warning("写入清理标记失败：%s", exc)
+
+    def _ensure_entry_folder(self, folder: str) -> None:
+        """创建年/月目录；本次运行中确认存在过的目录不再重复 makedirs。"""
+        if folder in self._known_entry_folders:
+            return
+        os.makedirs(folder, exist_ok=True)
+        self._known_entry_folders.add(folder)
+
     def _select_date(self, target: QDate) -> bool:
         if target == self._current_date:
             return True
@@ -518,11 +1102,11 @@ class DiaryBackend(QObject):
         self._current_date = target
         self._emit_date_related_signals()
         self.load_entry_for_date(target)
-        self._ensure_month_cache(target.year(), target.month())
-        self._bump_calendar_version()
+        self._preload_month(target.year(), target.month())
         return True
 
     def _confirm_pending_changes(self, title: str, message: str) -> bool:
+        self.finish_pending_save()
         if not self._content_modified:
             return True
 
@@ -551,6 +1135,7 @@ class DiaryBackend(QObject):
         if modified == self._content_modified:
             return
         self._content_modified = modified
+        self._sync_auto_save_timer()
         self.saveStateTextChanged.emit()
         self.windowTitleChanged.emit()
 
@@ -558,12 +1143,19 @@ class DiaryBackend(QObject):
         if enabled == self._auto_save_enabled:
             return
         self._auto_save_enabled = enabled
-        if enabled:
+        self._sync_auto_save_timer()
+        self.autoSaveEnabledChanged.emit()
+        self.autoSaveStatusTextChanged.emit()
+
+    def _sync_auto_save_timer(self) -> None:
+        """自动保存定时器只在开启且有未保存修改时运行；连续输入不会重启计时，内容干净时也不再定期唤醒。"""
+        should_run = self._auto_save_enabled and self._content_modified
+        if should_run == self._auto_save_timer.isActive():
+            return
+        if should_run:
             self._auto_save_timer.start()
         else:
             self._auto_save_timer.stop()
-        self.autoSaveEnabledChanged.emit()
-        self.autoSaveStatusTextChanged.emit()
 
     def _normalize_theme_mode(self, theme_mode: str | None) -> str:
         if isinstance(theme_mode, str) and theme_mode.strip().lower() == THEME_MODE_LIGHT:
@@ -683,55 +1275,84 @@ class DiaryBackend(QObject):
         if keyword == self._search_keyword:
             return
         self._search_keyword = keyword
-        self.searchPreviewRichTextChanged.emit()
+        if self._search_preview_highlighter is not None:
+            self._search_preview_highlighter.set_keyword(keyword)
 
     def _bump_calendar_version(self) -> None:
+        # 保存、迁移、清理、翻页预加载可能在同一轮事件中接连触发，合并成一次通知，
+        # 日历格子只重新查询一遍；缓存本身已同步更新，延迟的只是 QML 刷新
+        if self._calendar_refresh_pending:
+            return
+        self._calendar_refresh_pending = True
+        QTimer.singleShot(0, self._emit_calendar_version)
+
+    def _emit_calendar_version(self) -> None:
+        self._calendar_refresh_pending = False
         self._calendar_version += 1
         self.calendarVersionChanged.emit()
 
     def _format_date_display(self, date: QDate) -> str:
         weekday = WEEKDAY_LABELS.get(date.dayOfWeek(), "")
-        return f"{date.toString('yyyy-MM-dd')} · {weekday}"
+        return f"{_format_iso_date(date)} · {weekday}"
 
     def _new_path_for_date(self, date: QDate) -> str:
-        return os.path.join(
-            self._diary_folder_base,
-            date.toString("yyyy"),
-            date.toString("MM"),
-            f"{date.toString('yyyy-MM-dd')}.txt",
-        )
+        return _build_entry_path(self._diary_folder_base, date.year(), date.month(), date.day())
 
     def _relative_new_path_for_date(self, date: QDate) -> str:
         return self._new_path_for_date(date).replace("\\", "/")
 
-    def _legacy_path_for_date(self, date: QDate) -> str:
-        return os.path.join(self._old_diary_folder, f"{date.toString('yyyy-MM-dd')}.txt")
+    def _legacy_entry_name_index(self) -> set[str]:
+        """一次性列出旧扁平目录下的日记文件名，避免每次取路径都探测旧文件。"""
+        if self._legacy_entry_names is None:
+            names: set[str] = set()
+            # 已迁移的数据目录：首屏加载和首月扫描发生在延迟迁移之前，凭标记文件直接判定旧目录已清空
+            if os.path.exists(os.path.join(self._diary_folder_base, MIGRATION_SENTINEL_NAME)):
+                self._legacy_entry_names = names
+                return names
+            try:
+                with os.scandir(self._old_diary_folder) as entries:
+                    for entry in entries:
+                        if self._is_valid_diary_filename(entry.name) and entry.is_file():
+                            names.add(entry.name)
+            except OSError:
+                pass
+            self._legacy_entry_names = names
+        return self._legacy_entry_names
 
     def get_filename_for_date(self, date: QDate) -> str:
         new_file = self._new_path_for_date(date)
-        old_file = self._legacy_path_for_date(date)
+        legacy_names = self._legacy_entry_name_index()
+        if not legacy_names:
+            return new_file
 
-        if os.path.isfile(old_file) and not os.path.exists(new_file):
+        legacy_name = os.path.basename(new_file)
+        if legacy_name not in legacy_names:
+            return new_file
+
+        old_file = os.path.join(self._old_diary_folder, legacy_name)
+        if not os.path.exists(new_file):
             try:
-                os.makedirs(os.path.dirname(new_file), exist_ok=True)
-                with open(old_file, "r", encoding="utf-8") as src:
-                    legacy_content = src.read()
-                with open(new_file, "w", encoding="utf-8") as dst:
-                    dst.write(legacy_content)
+                self._ensure_entry_folder(os.path.dirname(new_file))
+                os.replace(old_file, new_file)
+            except FileNotFoundError:
+                pass
             except OSError as exc:
-                print(f"按需迁移旧日记失败：{exc}")
+                logger.warning("按需迁移旧日记失败：%s", exc)
+                return new_file
+        legacy_names.discard(legacy_name)
         return new_file
 
+    def _remember_entry(self, filename: str, mtime_ns: int, content: str) -> None:
+        self._entry_cache[filename] = (mtime_ns, content)
+        self._entry_cache.move_to_end(filename)
+        while len(self._entry_cache) > ENTRY_CACHE_SIZE:
+            self._entry_cache.popitem(last=False)
+
     def load_entry_for_date(self, date: QDate) -> None:
         filename = self.get_filename_for_date(date)
-        content = ""
-        try:
-            if os.path.exists(filename):
-                with open(filename, "r", encoding="utf-8") as file:
-                    content = file.read()
-        except OSError as exc:
-            QMessageBox.warning(None, "加载错误", f"无法加载 {date.toString('yyyy-MM-dd')} 的日记：\n\n{exc}")
+        content = self._read_entry_file(date, filename)
 
+        # 内容未变时不发信号，QML 编辑器不会被重新赋值
         content_changed = content != self._current_content
         self._current_content = content
         self._last_saved_content = content
@@ -739,12 +1360,38 @@ class DiaryBackend(QObject):
             self.currentContentChanged.emit()
         self._set_content_modified(False)
 
-    def save_entry_for_date(self, date: QDate, status_text: str = "已保存") -> bool:
-        target_folder = os.path.dirname(self._new_path_for_date(date))
-        filename = self.get_filename_for_date(date)
+    def _read_entry_file(self, date: QDate, filename: str) -> str:
+        """读取日记正文；缓存以文件 mtime 校验，未变时一次 stat 即可返回，外部修改过的文件会重新读取。"""
+        try:
+            mtime_ns = os.stat(filename).st_mtime_ns
+            cached = self._entry_cache.get(filename)
+            if cached is not None and cached[0] == mtime_ns:
+                self._entry_cache.move_to_end(filename)
+                return cached[1]
+            content = _decode_entry_bytes(Path(filename).read_bytes())
+        except FileNotFoundError:
+            self._entry_cache.pop(filename, None)
+            return ""
+        except OSError as exc:
+            QMessageBox.warning(None, "加载错误", f"无法加载 {_format_iso_date(date)} 的日记：\n\n{exc}")
+            return ""
+        self._remember_entry(filename, mtime_ns, content)
+        return content
+
+    def save_entry_for_date(self, date: QDate, status_text: str = "已保存", durable: bool = True) -> bool:
+        self.finish_pending_save()
+        if not self._content_modified:
+            # updateContent() 已维护脏标记；未修改时不碰磁盘，切换、搜索前保存都是零 I/O。
+            if status_text:
+                self._set_status(f"{status_text} · {_format_iso_date(date)}", 2000)
+            return True
+
         raw_content = self._current_content
-        stripped_content = raw_content.strip()
-        should_save = bool(stripped_content) or os.path.exists(filename)
+        filename = self.get_filename_for_date(date)
+        target_folder = os.path.dirname(filename)
+        # isspace() 不复制整篇正文，与 bool(raw_content.strip()) 判定等价
+        has_text = bool(raw_content) and not raw_content.isspace()
+        should_save = has_text or os.path.exists(filename)
 
         if not should_save:
             self._last_saved_content = raw_content
@@ -752,221 +1399,183 @@ class DiaryBackend(QObject):
             return True
 
         try:
-            os.makedirs(target_folder, exist_ok=True)
-            with open(filename, "w", encoding="utf-8") as file:
-                file.write(raw_content)
+            if raw_content:
+                self._ensure_entry_folder(target_folder)
+                _write_entry_atomically(filename, raw_content.encode("utf-8"), durable)
+            else:
+                # 清空即删除文件，磁盘上不留 0 字节日记，月份扫描无需再读文件大小
+                Path(filename).unlink(missing_ok=True)
         except OSError as exc:
-            QMessageBox.warning(None, "保存错误", f"无法保存 {date.toString('yyyy-MM-dd')} 的日记：\n\n{exc}")
+            self._known_entry_folders.discard(target_folder)
+            QMessageBox.warning(None, "保存错误", f"无法保存 {_format_iso_date(date)} 的日记：\n\n{exc}")
             return False
 
+        mtime_ns = None
+        if raw_content:
+            try:
+                mtime_ns = os.stat(filename).st_mtime_ns
+            except OSError:
+                pass
+        self._record_saved_entry(filename, raw_content, mtime_ns)
         self._last_saved_content = raw_content
         self._set_content_modified(False)
-        self._invalidate_month_cache(date.year(), date.month())
+        self._update_month_cache_entry(date, bool(raw_content))
         if status_text:
-            self._set_status(f"{status_text} · {date.toString('yyyy-MM-dd')}", 2000)
+            self._set_status(f"{status_text} · {_format_iso_date(date)}", 2000)
         return True
 
-    def _invalidate_month_cache(self, year: int, month: int) -> None:
-        self._month_entry_cache.pop((year, month), None)
-        self._bump_calendar_version()
+    def _record_saved_entry(self, filename: str, content: str, mtime_ns: int | None) -> None:
+        """写盘成功后同步正文缓存与检索缓存；拿不到 mtime 时宁可丢弃缓存项，下次从磁盘读取。"""
+        if content and mtime_ns is not None:
+            self._remember_entry(filename, mtime_ns, content)
+        else:
+            self._entry_cache.pop(filename, None)
+        self._search_text_cache.pop(filename, None)
+
+    def _update_month_cache_entry(self, date: QDate, has_entry: bool) -> None:
+        """保存后直接修正已缓存月份中的这一天，不必丢弃整月缓存再重新扫描目录。"""
+        cached = self._month_entry_cache.get((date.year(), date.month()))
+        if cached is None:
+            # 未缓存的月份不在日历上，首次显示时自然会重新载入
+            return
+        iso_date = _format_iso_date(date)
+        highlight_changed = (iso_date in cached) != has_entry
+        if has_entry:
+            cached.add(iso_date)
+        else:
+            cached.discard(iso_date)
+
+        # 原子保存（临时文件 + 替换）总会改变目录 mtime，记下新值以免翻页校验时误判为外部改动并重扫
+        folder_mtime = self._stat_month_folder(date.year(), date.month())
+        self._month_folder_mtimes[(date.year(), date.month())] = folder_mtime
+        if folder_mtime is not None and not self._legacy_entry_name_index():
+            self._record_month_index(date.year(), date.month(), cached, folder_mtime)
+        # 只有“有无日记”状态翻转时日历才需要重绘，普通的续写保存不触发格子重新查询
+        if highlight_changed:
+            self._bump_calendar_version()
+
+    def _preload_month(self, year: int, month: int) -> None:
+        """确保月份缓存有效；月份目录 mtime 变化（外部增删文件）时重扫，结果有变才通知 QML。"""
+        key = (year, month)
+        cached = self._month_entry_cache.get(key)
+        if cached is not None:
+            if self._stat_month_folder(year, month) == self._month_folder_mtimes.get(key):
+                return
+            del self._month_entry_cache[key]
+        dates = self._ensure_month_cache(year, month)
+        if dates != (cached or set()):
+            self._bump_calendar_version()
+
+    def _request_month_preload(self, year: int, month: int) -> None:
+        if not self._pending_month_preloads:
+            QTimer.singleShot(0, self._flush_month_preloads)
+        self._pending_month_preloads.add((year, month))
+
+    def _flush_month_preloads(self) -> None:
+        pending = self._pending_month_preloads
+        self._pending_month_preloads = set()
+        for year, month in pending:
+            self._preload_month(year, month)
 
     def _ensure_month_cache(self, year: int, month: int) -> set[str]:
         key = (year, month)
         if key not in self._month_entry_cache:
-            self._month_entry_cache[key] = self._scan_month_entries(year, month)
+            self._month_entry_cache[key] = self._load_month_entries(year, month)
         return self._month_entry_cache[key]
 
-    def _scan_month_entries(self, year: int, month: int) -> set[str]:
-        dates: set[str] = set()
-        month_folder = os.path.join(self._diary_folder_base, f"{year:04d}", f"{month:02d}")
+    def _month_folder(self, year: int, month: int) -> str:
+        return os.path.join(self._diary_folder_base, f"{year:04d}", f"{month:02d}")
 
-        if os.path.isdir(month_folder):
-            try:
-                for file_name in os.listdir(month_folder):
-                    if not self._is_valid_diary_filename(file_name):
-                        continue
-                    file_path = os.path.join(month_folder, file_name)
-                    if not os.path.isfile(file_path):
-                        continue
-                    if os.path.getsize(file_path) <= 0:
-                        continue
-                    entry_date = QDate.fromString(file_name[:-4], "yyyy-MM-dd")
-                    if entry_date.isValid() and entry_date.year() == year and entry_date.month() == month:
-                        dates.add(file_name[:-4])
-            except OSError as exc:
-                print(f"扫描目录失败 {month_folder}: {exc}")
+    def _stat_month_folder(self, year: int, month: int) -> int | None:
+        try:
+            return os.stat(self._month_folder(year, month)).st_mtime_ns
+        except OSError:
+            return None
 
-        if os.path.isdir(self._old_diary_folder):
-            prefix = f"{year:04d}-{month:02d}-"
+    def _load_month_entries(self, year: int, month: int) -> set[str]:
+        """优先使用持久化的月份索引；月份目录的 mtime 未变说明没有增删文件，可免去目录扫描。"""
+        folder_mtime = self._stat_month_folder(year, month)
+        self._month_folder_mtimes[(year, month)] = folder_mtime
+        if self._legacy_entry_name_index():
+            return self._scan_month_entries(year, month)
+        if folder_mtime is None:
+            return set()
+
+        prefix = f"{year:04d}-{month:02d}-"
+        record = self._load_entry_index().get(prefix[:-1])
+        if record is not None:
             try:
-                for file_name in os.listdir(self._old_diary_folder):
-                    if not file_name.startswith(prefix) or not self._is_valid_diary_filename(file_name):
-                        continue
-                    file_path = os.path.join(self._old_diary_folder, file_name)
-                    if os.path.isfile(file_path) and os.path.getsize(file_path) > 0:
-                        dates.add(file_name[:-4])
-            except OSError as exc:
-                print(f"扫描旧目录失败 {self._old_diary_folder}: {exc}")
-
+                recorded_mtime, days = record
+                if recorded_mtime == folder_mtime:
+                    return {f"{prefix}{day:02d}" for day in days}
+            except (TypeError, ValueError):
+                pass
+
+        # 先取 mtime 再扫描：扫描期间若有文件变动，记录的 mtime 只会偏旧，下次仍会重扫
+        dates = self._scan_month_entries(year, month)
+        self._record_month_index(year, month, dates, folder_mtime)
         return dates
 
-    def date_has_entry(self, date: QDate) -> bool:
-        if not date.isValid():
-            return False
-
-        new_file = self._new_path_for_date(date)
-        if os.path.isfile(new_file):
+    def _load_entry_index(self) -> dict[str, list]:
+        if self._entry_index is None:
+            index_path = os.path.join(self._diary_folder_base, ENTRY_INDEX_NAME)
             try:
-                return os.path.getsize(new_file) > 0
-            except OSError:
-                return False
-
-        old_file = self._legacy_path_for_date(date)
-        if os.path.isfile(old_file):
-            try:
-                return os.path.getsize(old_file) > 0
-            except OSError:
-                return False
-        return False
-
-    def search_diary_entries(self, keyword: str) -> list[SearchResultItem]:
-        results: list[SearchResultItem] = []
-        normalized_keyword = keyword.lower()
-        diary_files = self._collect_all_diary_files()
-        total_files = len(diary_files)
-
-        for index, file_path in enumerate(diary_files, start=1):
-            if index == 1 or index % 8 == 0:
-                self._set_status(f"正在搜索… {index}/{total_files}", 0)
-                self._app.processEvents()
-
-            try:
-                file_size = os.path.getsize(file_path)
-            except OSError:
-                continue
+                with open(index_path, "r", encoding="utf-8") as file:
+                    loaded = json.load(file)
+            except FileNotFoundError:
+                loaded = {}
+            except (OSError, ValueError) as exc:
+                logger.warning("读取月份索引失败：%s", exc)
+                loaded = {}
+            self._entry_index = loaded if isinstance(loaded, dict) else {}
+        return self._entry_index
+
+    def _record_month_index(self, year: int, month: int, dates: set[str], folder_mtime: int) -> None:
+        days = sorted(int(iso_date[8:]) for iso_date in dates)
+        self._load_entry_index()[f"{year:04d}-{month:02d}"] = [folder_mtime, days]
+        self._entry_index_timer.start()
 
-            if file_size > MAX_SEARCHABLE_FILE_SIZE:
-                continue
-
-            self._search_in_file(file_path, normalized_keyword, results)
-            if len(results) >= MAX_SEARCH_RESULTS:
-                break
-
-        results.sort(key=lambda item: item.date, reverse=True)
-        return results[:MAX_SEARCH_RESULTS]
-
-    def _collect_all_diary_files(self) -> list[str]:
-        files_by_name: dict[str, str] = {}
-
-        if not os.path.isdir(self._diary_folder_base):
-            return []
-
-        for root, _, filenames in os.walk(self._diary_folder_base):
-            for file_name in filenames:
-                if not self._is_valid_diary_filename(file_name):
-                    continue
-                file_path = os.path.join(root, file_name)
-                existing = files_by_name.get(file_name)
-                if existing is None:
-                    files_by_name[file_name] = file_path
-                    continue
-
-                existing_depth = existing.count(os.sep)
-                current_depth = file_path.count(os.sep)
-                if current_depth > existing_depth:
-                    files_by_name[file_name] = file_path
-
-        return sorted(files_by_name.values())
-
-    def _is_valid_diary_filename(self, filename: str) -> bool:
-        if not filename.endswith(".txt"):
-            return False
-        date = QDate.fromString(filename[:-4], "yyyy-MM-dd")
-        return date.isValid()
-
-    def _search_in_file(
-        self,
-        file_path: str,
-        keyword: str,
-        results: list[SearchResultItem],
-    ) -> None:
-        file_name = os.path.basename(file_path)
-        entry_date = QDate.fromString(file_name[:-4], "yyyy-MM-dd")
-        if not entry_date.isValid():
+    @pyqtSlot()
+    def flush_entry_index(self) -> None:
+        """把月份索引写回磁盘；保存与扫描产生的改动经定时器合并后才落盘。"""
+        self._entry_index_timer.stop()
+        if self._entry_index is None:
             return
-
+        index_path = os.path.join(self._diary_folder_base, ENTRY_INDEX_NAME)
+        temp_path = f"{index_path}.tmp"
         try:
-            file_size = os.path.getsize(file_path)
-            max_bytes = min(file_size, MAX_PREVIEW_FILE_SIZE)
-            with open(file_path, "r", encoding="utf-8", errors="ignore") as file:
-                content = file.read(max_bytes)
-            if file_size > MAX_PREVIEW_FILE_SIZE:
-                content += "\n\n[文件较大，预览已截断...]"
-        except OSError:
-            return
-
-        lowered_content = content.lower()
-        if keyword not in lowered_content:
-            return
-
-        if len(content) > MAX_CONTENT_LENGTH:
-            content = content[:MAX_CONTENT_LENGTH] + "\n\n[内容过长，已截断显示...]"
-
-        results.append(
-            SearchResultItem(
-                date=entry_date,
-                content=content,
-                match_text=self._extract_context(content, keyword),
-            )
-        )
-
-    def _extract_context(self, content: str, keyword: str, context_chars: int = 42) -> str:
-        lowered_content = content.lower()
-        lowered_keyword = keyword.lower()
-        position = lowered_content.find(lowered_keyword)
-        if position < 0:
-            return ""
-
-        start = max(0, position - context_chars)
-        end = min(len(content), position + len(keyword) + context_chars)
-        snippet = content[start:end].replace("\n", " ").strip()
-        if start > 0:
-            snippet = "..." + snippet
-        if end < len(content):
-            snippet += "..."
-        return snippet
+            with open(temp_path, "w", encoding="utf-8") as file:
+                json.dump(self._entry_index, file, separators=(",", ":"))
+            os.replace(temp_path, index_path)
+        except OSError as exc:
+            logger.warning("写入月份索引失败：%s", exc)
 
-    def _build_highlighted_preview_html(self, content: str, keyword: str) -> str:
-        if not content:
-            return ""
+    def _scan_month_entries(self, year: int, month: int) -> set[str]:
+        dates: set[str] = set()
+        prefix = f"{year:04d}-{month:02d}-"
+        self._collect_month_dates(self._month_folder(year, month), prefix, dates)
+        # 旧扁平目录已由文件名索引一次性列出，各月份直接按前缀筛选，不再逐月 scandir
+        dates.update(name[:-4] for name in self._legacy_entry_name_index() if name.startswith(prefix))
+        return dates
 
-        pattern = re.compile(re.escape(keyword), re.IGNORECASE) if keyword else None
-        segments: list[str] = []
-        last_end = 0
-
-        if pattern is not None:
-            for match in pattern.finditer(content):
-                start, end = match.span()
-                if start > last_end:
-                    segments.append(self._escape_preview_html(content[last_end:start]))
-                segments.append(
-                    "<span style=\"background-color:#FDE68A;color:#7C2D12;font-weight:600;\">"
-                    f"{self._escape_preview_html(content[start:end])}"
-                    "</span>"
+    def _collect_month_dates(self, folder: str, prefix: str, dates: set[str]) -> None:
+        """单次 os.scandir 遍历目录；空日记保存时即被删除，文件类型取自目录项即可，无需 stat。"""
+        try:
+            with os.scandir(folder) as entries:
+                dates.update(
+                    entry.name[:-4]
+                    for entry in entries
+                    if entry.name.startswith(prefix)
+                    and _parse_entry_filename(entry.name) is not None
+                    and entry.is_file()
                 )
-                last_end = end
-
-        if last_end < len(content):
-            segments.append(self._escape_preview_html(content[last_end:]))
-
-        body = "".join(segments) if segments else self._escape_preview_html(content)
-        return f"<div style=\"margin:0;\">{body}</div>"
+        except FileNotFoundError:
+            return
+        except OSError as exc:
+            logger.warning("扫描目录失败 %s: %s", folder, exc)
 
-    def _escape_preview_html(self, text: str) -> str:
-        escaped = html.escape(text.replace("\t", "    "))
-        while "  " in escaped:
-            escaped = escaped.replace("  ", "&nbsp; ")
-        return escaped.replace("\n", "<br/>")
+    def _is_valid_diary_filename(self, filename: str) -> bool:
+        return _parse_entry_filename(filename) is not None
 
 
 def resolve_runtime_path(*parts: str) -> Path:
@@ -974,18 +1583,24 @@ def resolve_runtime_path(*parts: str) -> Path:
     return base_dir.joinpath(*parts)
 
 
+@lru_cache(maxsize=1)
+def _resolve_application_icon() -> QIcon:
+    """优先使用编译进 Qt 资源的图标，否则按候选顺序查找磁盘文件；只解码一次。"""
+    if QFile.exists(ICON_RESOURCE_PATH):
+        return QIcon(ICON_RESOURCE_PATH)
+    candidates = (Path.cwd() / "icon.ico", resolve_runtime_path("icon.ico"))
+    icon_path = next((path for path in candidates if path.exists()), None)
+    return QIcon(str(icon_path)) if icon_path is not None else QIcon()
+
+
 def load_application_icon(app: QApplication) -> None:
-    candidates = [
-        Path.cwd() / "icon.ico",
-        resolve_runtime_path("icon.ico"),
-    ]
-    for path in candidates:
-        if path.exists():
-            app.setWindowIcon(QIcon(str(path)))
-            return
+    icon = _resolve_application_icon()
+    if not icon.isNull():
+        app.setWindowIcon(icon)
 
 
 def main() -> int:
+    logging.basicConfig(level=logging.WARNING, format="%(levelname)s %(name)s: %(message)s")
     if os.environ.get("QT_QUICK_CONTROLS_STYLE", "").lower() in {"", "windows", "macos", "ios", "android"}:
         os.environ["QT_QUICK_CONTROLS_STYLE"] = "Basic"
     app = QApplication(sys.argv)
@@ -996,6 +1611,8 @@ def main() -> int:
     load_application_icon(app)
 
     backend = DiaryBackend(app)
+    app.aboutToQuit.connect(backend.finish_pending_save)
+    app.aboutToQuit.connect(backend.flush_entry_index)
     engine = QQmlApplicationEngine()
     engine.rootContext().setContextProperty("backend", backend)
 
@@ -35,7 +35,6 @@ ApplicationWindow {
         property var searchResultsModel: null
         property string searchPreviewDate: ""
         property string searchPreviewContent: ""
-        property string searchPreviewRichText: ""
 
         function preloadMonth(year, month) {}
         function requestWindowClose() {}
@@ -48,7 +47,8 @@ ApplicationWindow {
         function updateContent(text) {}
         function openSearchResult(index) {}
         function selectDate(isoDate) {}
-        function hasEntryForDate(isoDate) { return false }
+        function attachSearchPreviewDocument(textDocument) {}
+        function entriesForMonth(year, month) { return [] }
     }
 
     property var backendSafe: backendReady ? backendRef : backendStub
@@ -136,7 +136,6 @@ ApplicationWindow {
         bottomPadding: 9
         font.pixelSize: 13
         font.bold: true
-        font.family: root.uiFontFamily
         hoverEnabled: true
 
         contentItem: Text {
@@ -177,7 +176,6 @@ ApplicationWindow {
         bottomPadding: 0
         color: root.primaryColor
         font.pixelSize: 13
-        font.family: root.uiFontFamily
         placeholderTextColor: root.secondaryTextColor
         selectedTextColor: root.primaryForegroundColor
         selectionColor: root.primaryColor
@@ -212,7 +210,6 @@ ApplicationWindow {
         hoverEnabled: false
         spacing: 10
         font.pixelSize: 13
-        font.family: root.uiFontFamily
 
         indicator: Rectangle {
             x: 0
@@ -281,7 +278,6 @@ ApplicationWindow {
                         : root.primaryColor
             font.pixelSize: 12
             font.bold: true
-            font.family: root.uiFontFamily
         }
     }
 
@@ -289,7 +285,7 @@ ApplicationWindow {
         const jsDate = new Date(dateText + "T00:00:00")
         sidebar.shownYear = jsDate.getFullYear()
         sidebar.shownMonth = jsDate.getMonth()
-        root.backendSafe.preloadMonth(sidebar.shownYear, sidebar.shownMonth)
+        sidebar.requestPreload()
     }
 
     function openInPageSearch() {
@@ -350,7 +346,6 @@ ApplicationWindow {
                     text: "日历笔记本"
                     font.pixelSize: 26
                     font.bold: true
-                    font.family: root.uiFontFamily
                     color: root.primaryColor
                 }
 
@@ -360,7 +355,6 @@ ApplicationWindow {
                         : "采用 shadcn 风格的纵向紧凑布局，在窄窗口下优先保证信息密度与可读性。"
                     color: root.secondaryTextColor
                     font.pixelSize: 13
-                    font.family: root.uiFontFamily
                     wrapMode: Text.Wrap
                 }
             }
@@ -406,7 +400,6 @@ ApplicationWindow {
                     : root.backendSafe.saveStateText + " · " + root.backendSafe.currentEntryPath
                 color: root.secondaryTextColor
                 font.pixelSize: 12
-                font.family: root.uiFontFamily
                 elide: Text.ElideRight
             }
 
@@ -415,7 +408,6 @@ ApplicationWindow {
                 color: root.backendSafe.autoSaveEnabled ? root.successColor : root.dangerColor
                 font.pixelSize: 12
                 font.bold: true
-                font.family: root.uiFontFamily
             }
         }
     }
@@ -467,8 +459,8 @@ ApplicationWindow {
                 return
             }
             searchResultsPopup.open()
+            // 后端在发出 searchCompleted 前已选中第一条结果，这里只同步列表的当前行
             searchResultsList.currentIndex = 0
-            root.backendSafe.selectSearchResult(0)
         }
 
         function onWindowCloseApproved() {
@@ -477,10 +469,10 @@ ApplicationWindow {
         }
 
         function onCurrentContentChanged() {
+            // 赋值会触发 editor.onTextChanged，由它统一刷新页面内查找；内容相同则无需任何处理
             if (editor.text !== root.backendSafe.currentContent) {
                 editor.text = root.backendSafe.currentContent
             }
-            inPageSearchPopup.refreshMatches()
         }
     }
 
@@ -524,8 +516,17 @@ ApplicationWindow {
                 shownMonth = newMonth
             }
 
-            onShownMonthChanged: root.backendSafe.preloadMonth(shownYear, shownMonth)
-            onShownYearChanged: root.backendSafe.preloadMonth(shownYear, shownMonth)
+            function preloadShownMonth() {
+                root.backendSafe.preloadMonth(shownYear, shownMonth)
+            }
+
+            function requestPreload() {
+                // 年、月常在同一轮事件中先后变化，合并为一次预加载，也避免加载跨年时的中间月份
+                Qt.callLater(sidebar.preloadShownMonth)
+            }
+
+            onShownMonthChanged: requestPreload()
+            onShownYearChanged: requestPreload()
 
             ColumnLayout {
                 anchors.fill: parent
@@ -597,7 +598,9 @@ ApplicationWindow {
                     font.pixelSize: 14
                     font.bold: true
                     onClicked: {
-                        if (root.backendSafe.returnToToday())
+                        // 日期真正切换时 onCurrentDateChanged 已同步月份，这里只处理“已经位于今天”的情况
+                        const previousDate = root.backendSafe.currentDate
+                        if (root.backendSafe.returnToToday() && root.backendSafe.currentDate === previousDate)
                             root.syncShownMonth(root.backendSafe.currentDate)
                     }
                 }
@@ -687,19 +690,36 @@ ApplicationWindow {
                                 Layout.fillWidth: true
                                 Layout.fillHeight: true
 
+                                // 网格含前后月份的补位日期：每次刷新只向后端取三个月的数据，格子在此查表
+                                readonly property var entryLookup: {
+                                    const lookup = {}
+                                    if (!root.backendReady)
+                                        return lookup
+                                    const token = root.backendRef.calendarVersion
+                                    for (let offset = -1; offset <= 1; ++offset) {
+                                        let shownMonth = month + offset
+                                        let shownYear = year
+                                        if (shownMonth < 0) {
+                                            shownMonth = 11
+                                            shownYear -= 1
+                                        } else if (shownMonth > 11) {
+                                            shownMonth = 0
+                                            shownYear += 1
+                                        }
+                                        const dates = root.backendRef.entriesForMonth(shownYear, shownMonth)
+                                        for (let i = 0; i < dates.length; ++i)
+                                            lookup[dates[i]] = true
+                                    }
+                                    return lookup
+                                }
+
                                 delegate: Rectangle {
                                     required property var model
                                     readonly property string isoDate: Qt.formatDate(model.date, "yyyy-MM-dd")
                                     readonly property bool isCurrentMonth: model.month === monthGrid.month
                                     readonly property bool backendAvailable: root.backendReady
                                     readonly property bool isSelected: backendAvailable && root.backendRef.currentDate === isoDate
-                                    readonly property int refreshToken: backendAvailable ? root.backendRef.calendarVersion : 0
-                                    readonly property bool hasEntry: {
-                                        if (!backendAvailable)
-                                            return false
-                                        const token = refreshToken
-                                        return root.backendRef.hasEntryForDate(isoDate)
-                                    }
+                                    readonly property bool hasEntry: monthGrid.entryLookup[isoDate] === true
                                     radius: 12
                                     color: isSelected ? root.primaryColor : (cellArea.containsMouse ? root.accentSoftColor : "transparent")
                                     border.color: model.today && !isSelected ? root.ringColor : "transparent"
@@ -862,6 +882,7 @@ ApplicationWindow {
                             Component.onCompleted: text = root.backendSafe.currentContent
                             onTextChanged: {
                                 root.backendSafe.updateContent(text)
+                                inPageSearchPopup.invalidateEditorText()
                                 inPageSearchPopup.refreshMatches()
                             }
                         }
@@ -962,6 +983,7 @@ ApplicationWindow {
                         clip: true
                         spacing: 8
                         model: root.backendSafe.searchResultsModel
+                        reuseItems: true
                         currentIndex: -1
                         onCurrentIndexChanged: root.backendSafe.selectSearchResult(currentIndex)
 
@@ -1046,11 +1068,12 @@ ApplicationWindow {
 
                             TextArea {
                                 readOnly: true
-                                text: root.backendSafe.searchPreviewRichText
+                                text: root.backendSafe.searchPreviewContent
                                 wrapMode: TextArea.Wrap
                                 selectByMouse: true
                                 persistentSelection: true
-                                textFormat: TextEdit.RichText
+                                textFormat: TextEdit.PlainText
+                                Component.onCompleted: root.backendSafe.attachSearchPreviewDocument(textDocument)
                                 color: root.primaryColor
                                 selectionColor: root.editorSelectionColor
                                 selectedTextColor: root.primaryColor
@@ -1077,10 +1100,20 @@ ApplicationWindow {
         padding: 0
         width: Math.max(320, Math.min(420, editorCard.width - 32))
         height: 180
-        property var matches: []
+        // 所有匹配长度相同，只记起始偏移；选区在跳转到某个匹配时才据此生成
+        property var matchStarts: []
+        property int matchLength: 0
         property int currentMatchIndex: -1
-        property int matchCount: matches.length
+        property int matchCount: matchStarts.length
         property bool positionInitialized: false
+        // 忽略大小写时复用上一次的小写正文；只有编辑器内容变化才需要重新 toLowerCase()
+        property string loweredEditorText: ""
+        property bool loweredEditorTextValid: false
+        // 上一次扫描的条件；查找词、大小写选项与正文都没变时不再重复扫描
+        property int editorTextRevision: 0
+        property int lastMatchRevision: -1
+        property string lastMatchQuery: ""
+        property bool lastMatchCaseSensitive: false
         property real dragStartSceneX: 0
         property real dragStartSceneY: 0
         property real dragStartPopupX: 0
@@ -1101,37 +1134,74 @@ ApplicationWindow {
                          Math.min(y, root.height - height - root.pagePadding))
         }
 
+        function invalidateEditorText() {
+            loweredEditorTextValid = false
+            editorTextRevision += 1
+        }
+
+        function searchSourceText() {
+            if (caseSensitiveCheck.checked)
+                return editor.text
+            if (!loweredEditorTextValid) {
+                loweredEditorText = editor.text.toLowerCase()
+                loweredEditorTextValid = true
+            }
+            return loweredEditorText
+        }
+
         function refreshMatches() {
             if (!visible) {
-                matches = []
+                matchStarts = []
                 currentMatchIndex = -1
+                lastMatchRevision = -1
                 return
             }
 
             const query = findField.text
             if (!query || query.length === 0) {
-                matches = []
+                matchStarts = []
                 currentMatchIndex = -1
+                lastMatchRevision = -1
                 editor.deselect()
                 return
             }
 
-            const source = caseSensitiveCheck.checked ? editor.text : editor.text.toLowerCase()
+            if (lastMatchRevision === editorTextRevision
+                    && lastMatchQuery === query
+                    && lastMatchCaseSensitive === caseSensitiveCheck.checked)
+                return
+            lastMatchRevision = editorTextRevision
+            lastMatchQuery = query
+            lastMatchCaseSensitive = caseSensitiveCheck.checked
+
+            const source = searchSourceText()
             const needle = caseSensitiveCheck.checked ? query : query.toLowerCase()
             const found = []
-            let from = 0
-
-            while (from <= source.length - needle.length) {
-                const pos = source.indexOf(needle, from)
-                if (pos < 0)
-                    break
-                found.push({ start: pos, end: pos + query.length })
-                from = pos + Math.max(needle.length, 1)
+
+            // 偏移与编辑器一致按 UTF-16 计；个别字符（如 İ）小写后会变长，此时小写正文的下标对不上原文，改用忽略大小写的正则
+            if (!caseSensitiveCheck.checked && source.length !== editor.text.length) {
+                const pattern = new RegExp(query.replace(/[.*+?^${}()|[\]\\]/g, "\\$&"), "gi")
+                let match
+                while ((match = pattern.exec(editor.text)) !== null) {
+                    found.push(match.index)
+                    if (match[0].length === 0)
+                        pattern.lastIndex += 1
+                }
+            } else {
+                let from = 0
+                while (from <= source.length - needle.length) {
+                    const pos = source.indexOf(needle, from)
+                    if (pos < 0)
+                        break
+                    found.push(pos)
+                    from = pos + Math.max(needle.length, 1)
+                }
             }
 
-            matches = found
-            if (matches.length > 0) {
-                const nextIndex = currentMatchIndex >= 0 && currentMatchIndex < matches.length
+            matchLength = query.length
+            matchStarts = found
+            if (found.length > 0) {
+                const nextIndex = currentMatchIndex >= 0 && currentMatchIndex < matchCount
                     ? currentMatchIndex
                     : 0
                 selectMatch(nextIndex)
@@ -1142,16 +1212,22 @@ ApplicationWindow {
         }
 
         function selectMatch(index) {
-            if (index < 0 || index >= matches.length)
+            if (index < 0 || index >= matchCount)
+                return
+
+            const start = matchStarts[index]
+            // 只有一个匹配时反复“下一个”会落在同一处，选区已经就位就不再来回切换焦点
+            if (index === currentMatchIndex
+                    && editor.selectionStart === start
+                    && editor.selectionEnd === start + matchLength)
                 return
 
             currentMatchIndex = index
-            const match = matches[index]
             const findCursorPosition = findField.cursorPosition
 
             editor.forceActiveFocus()
-            editor.cursorPosition = match.start
-            editor.moveCursorSelection(match.end, TextEdit.SelectCharacters)
+            editor.cursorPosition = start
+            editor.moveCursorSelection(start + matchLength, TextEdit.SelectCharacters)
 
             Qt.callLater(function() {
                 if (!inPageSearchPopup.visible)
@@ -1162,15 +1238,15 @@ ApplicationWindow {
         }
 
         function findNext() {
-            if (matches.length === 0)
+            if (matchCount === 0)
                 return
-            selectMatch((currentMatchIndex + 1) % matches.length)
+            selectMatch((currentMatchIndex + 1) % matchCount)
         }
 
         function findPrevious() {
-            if (matches.length === 0)
+            if (matchCount === 0)
                 return
-            selectMatch((currentMatchIndex - 1 + matches.length) % matches.length)
+            selectMatch((currentMatchIndex - 1 + matchCount) % matchCount)
         }
 
         onOpened: {
@@ -1183,7 +1259,10 @@ ApplicationWindow {
         }
 
         onClosed: {
-            matches = []
+            loweredEditorText = ""
+            loweredEditorTextValid = false
+            lastMatchRevision = -1
+            matchStarts = []
             currentMatchIndex = -1
             editor.deselect()
             editor.forceActiveFocus()